@@ -1,12 +1,13 @@
 import asyncio
 import logging
-import json
-import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Final
+from urllib.parse import urlsplit, urlunsplit
 
-from pymongo import AsyncMongoClient
-from duckduckgo_search import DDGS
-from newspaper import Article
+import httpx
+import orjson
+from cachetools import TTLCache
 
 from flexus_client_kit import ckit_client
 from flexus_client_kit import ckit_cloudtool
@@ -28,7 +29,7 @@ BOT_VERSION = "0.0.6"
 
 
 # Tool for initiating web research
-WEB_RESEARCH_TOOL = ckit_cloudtool.CloudTool(
+WEB_RESEARCH_TOOL: Final = ckit_cloudtool.CloudTool(
     strict=True,
     name="web_research",
     description="Perform parallel web searches to gather information on a topic. Returns search results that can be further analyzed.",
@@ -55,7 +56,7 @@ WEB_RESEARCH_TOOL = ckit_cloudtool.CloudTool(
 )
 
 # Tool for reading and summarizing web content
-READ_ARTICLE_TOOL = ckit_cloudtool.CloudTool(
+READ_ARTICLE_TOOL: Final = ckit_cloudtool.CloudTool(
     strict=True,
     name="read_article",
     description="Read and analyze content from web URLs in parallel. Extracts key information and insights.",
@@ -78,7 +79,7 @@ READ_ARTICLE_TOOL = ckit_cloudtool.CloudTool(
 )
 
 # Tool for creating comprehensive research reports
-CREATE_RESEARCH_REPORT_TOOL = ckit_cloudtool.CloudTool(
+CREATE_RESEARCH_REPORT_TOOL: Final = ckit_cloudtool.CloudTool(
     strict=True,
     name="create_research_report",
     description="Create a comprehensive research report document at the specified path.",
@@ -121,7 +122,7 @@ CREATE_RESEARCH_REPORT_TOOL = ckit_cloudtool.CloudTool(
     },
 )
 
-TOOLS = [
+TOOLS: Final = [
     WEB_RESEARCH_TOOL,
     READ_ARTICLE_TOOL,
     CREATE_RESEARCH_REPORT_TOOL,
@@ -130,11 +131,121 @@ TOOLS = [
 ]
 
 # Tools for the researcher subchat (no recursive research tools)
-TOOLS_SUBCHAT = [
+TOOLS_SUBCHAT: Final = [
     fi_mongo_store.MONGO_STORE_TOOL,
     fi_pdoc.POLICY_DOCUMENT_TOOL,
 ]
 
+# Serialized once for install(), the tool definitions never change at runtime
+TOOLS_JSON: Final = orjson.dumps([t.openai_style_tool() for t in TOOLS]).decode()
+TOOLS_SUBCHAT_JSON: Final = orjson.dumps([t.openai_style_tool() for t in TOOLS_SUBCHAT]).decode()
+
+
+# date_filter / date_range setting -> DDGS timelimit, anything else ('any', 'custom') searches without a limit
+DATE_FILTER_TIMELIMITS = {
+    "last_week": "w",
+    "last_month": "m",
+    "last_year": "y",
+}
+
+# Research loops re-run the same searches and re-read the same pages, keep recent results around.
+# Only successful results are cached, failures always go back to the network.
+_ddgs_cache: TTLCache = TTLCache(maxsize=2048, ttl=900)
+_article_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+
+DDGS_POOL_MAX_IDLE = 5
+
+# All bots in the process share one outbound IP, keep the total DDG fan-out below what gets rate-limited
+DDGS_MAX_CONCURRENT_QUERIES = 10
+_ddgs_semaphore = asyncio.Semaphore(DDGS_MAX_CONCURRENT_QUERIES)
+
+
+def _ndjson(items: List[Dict[str, Any]]) -> str:
+    # One JSON object per line: the model can use each query / article on its own without matching brackets across the whole blob
+    return b"\n".join(orjson.dumps(item) for item in items).decode()
+
+
+def _canonical_url(url: str) -> str:
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        # Malformed (e.g. a broken IPv6 host), key it as is and let the fetch report the per-url error
+        return url
+    # Only the host is case-insensitive, credentials in user:pass@ must stay as given
+    userinfo, at, hostport = parts.netloc.rpartition("@")
+    return urlunsplit((parts.scheme.lower(), userinfo + at + hostport.lower(), parts.path or "/", parts.query, ""))
+
+
+def _search_sync(ddgs: Any, query: str, region: str, timelimit: Optional[str], max_results: int) -> list:
+    # Blocking, run it via asyncio.to_thread(). DDGS is not safe to share between threads, the caller lends one instance per query
+    return list(ddgs.text(query, region=region, timelimit=timelimit, max_results=max_results))
+
+
+# Parsing is CPU work (lxml releases the GIL), give it its own pool so it doesn't queue behind blocking DDGS searches
+_parse_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="article_parse")
+
+ARTICLE_MAX_BYTES = 2_000_000
+# Total deadline per page, httpx timeouts only bound each connect/read/write separately
+ARTICLE_FETCH_TIMEOUT = 15.0
+
+# Per bot, at most this many pages download at once; cache hits and parsing don't count
+ARTICLE_MAX_CONCURRENT_FETCHES = 8
+
+
+async def _fetch_html(http: httpx.AsyncClient, url: str) -> bytes:
+    # Never pull more than ARTICLE_MAX_BYTES, some links are huge PDFs or SPA bundles; trafilatura copes with cut-off HTML
+    async with http.stream("GET", url) as resp:
+        resp.raise_for_status()
+        content_length = int(resp.headers.get("content-length") or 0)
+        if content_length > ARTICLE_MAX_BYTES:
+            raise ValueError(f"Page is too large: {content_length} bytes, the limit is {ARTICLE_MAX_BYTES}")
+        body = bytearray()
+        async for chunk in resp.aiter_bytes():
+            body += chunk
+            if len(body) >= ARTICLE_MAX_BYTES:
+                break
+    return bytes(body[:ARTICLE_MAX_BYTES])
+
+
+def _fetch_error_str(e: BaseException) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"HTTP {e.response.status_code} {e.response.reason_phrase}"
+    if isinstance(e, (httpx.TimeoutException, asyncio.TimeoutError)):
+        return "Timed out while downloading the page"
+    return str(e) or type(e).__name__
+
+
+def _parse_article(url: str, html: bytes) -> Dict[str, Any]:
+    import trafilatura
+    tree = trafilatura.load_html(html)
+    if tree is None:
+        raise ValueError("Could not parse the page as HTML")
+    # Metadata first: it only reads the tree, while extract() prunes it in place
+    meta = trafilatura.extract_metadata(tree, default_url=url)
+    text = trafilatura.extract(tree, url=url, include_comments=False, include_tables=False, favor_precision=True) or ""
+    text_head = text[:5000]
+    return {
+        "url": url,
+        "title": meta.title if meta else None,
+        "authors": [a.strip() for a in meta.author.split(";")] if meta and meta.author else [],
+        "publish_date": meta.date if meta else None,
+        "text": text_head,
+        "summary": text_head[:500] + "..." if len(text) > 500 else text_head,
+    }
+
+
+# Bots of one group run in the same process, personas resolving to the same connection string share one pool
+_mongo_clients: Dict[str, Any] = {}
+
+
+def _shared_mongo_client(conn_str: str) -> Any:
+    from pymongo import AsyncMongoClient
+    client = _mongo_clients.get(conn_str)
+    if client is None:
+        client = AsyncMongoClient(conn_str, maxPoolSize=50)
+        _mongo_clients[conn_str] = client
+    return client
+
 
 async def deep_research_main_loop(fclient: ckit_client.FlexusClient, rcx: ckit_bot_exec.RobotContext) -> None:
     from deep_research_install import deep_research_setup_schema
@@ -142,15 +253,31 @@ async def deep_research_main_loop(fclient: ckit_client.FlexusClient, rcx: ckit_b
     setup = ckit_bot_exec.official_setup_mixing_procedure(deep_research_setup_schema, rcx.persona.persona_setup)
 
     mongo_conn_str = await ckit_mongo.mongo_fetch_creds(fclient, rcx.persona.persona_id)
-    mongo = AsyncMongoClient(mongo_conn_str)
+    mongo = _shared_mongo_client(mongo_conn_str)
     dbname = rcx.persona.persona_id + "_db"
     mydb = mongo[dbname]
     personal_mongo = mydb["personal_mongo"]
 
+    research_language = setup.get("research_language", "en")
+    region = f"{research_language}-{research_language}" if research_language and research_language != "en" else "wt-wt"
+
     pdoc_integration = fi_pdoc.IntegrationPdoc(rcx, rcx.persona.ws_root_group_id)
 
-    # Track research depth usage per thread
-    research_depth_used = {}
+    # One pooled client for the lifetime of the bot, keep-alive and HTTP/2 save a TLS handshake per article
+    http = httpx.AsyncClient(
+        http2=True,
+        timeout=15.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=30),
+    )
+
+    article_fetch_semaphore = asyncio.Semaphore(ARTICLE_MAX_CONCURRENT_FETCHES)
+
+    # Idle DDGS instances kept between calls so their HTTP sessions stay warm, only touched from the event loop
+    ddgs_pool: List[Any] = []
+
+    # Track research depth usage per thread, forget threads untouched for a day so this doesn't grow forever
+    research_depth_used = TTLCache(maxsize=10_000, ttl=24 * 3600)
 
     @rcx.on_updated_message
     async def updated_message_in_db(msg: ckit_ask_model.FThreadMessageOutput):
@@ -162,7 +289,7 @@ async def deep_research_main_loop(fclient: ckit_client.FlexusClient, rcx: ckit_b
 
     @rcx.on_updated_task
     async def updated_task_in_db(t: ckit_kanban.FPersonaKanbanTaskOutput):
-        logger.info(f"Deep Research task update: {t}")
+        logger.info("Deep Research task update: %s", t)
         pass
 
     @rcx.on_tool_call(WEB_RESEARCH_TOOL.name)
@@ -187,45 +314,53 @@ async def deep_research_main_loop(fclient: ckit_client.FlexusClient, rcx: ckit_b
 
         effective_date_filter = date_filter if date_filter else setup.get("date_range", "any")
 
-        timelimit = None
-        if effective_date_filter == "last_week":
-            timelimit = "w"
-        elif effective_date_filter == "last_month":
-            timelimit = "m"
-        elif effective_date_filter == "last_year":
-            timelimit = "y"
-
-        region = "wt-wt"
-        research_language = setup.get("research_language", "en")
-        if research_language and research_language != "en":
-            region = f"{research_language}-{research_language}"
+        timelimit = DATE_FILTER_TIMELIMITS.get(effective_date_filter)
+
+        async def search_cached(query: str) -> list:
+            key = (query, region, timelimit, max_results)
+            results = _ddgs_cache.get(key)
+            if results is None:
+                async with _ddgs_semaphore:
+                    # Borrow only once a slot is free, so queries queued on the semaphore don't hold or create instances
+                    if ddgs_pool:
+                        ddgs = ddgs_pool.pop()
+                    else:
+                        from duckduckgo_search import DDGS
+                        ddgs = DDGS()
+                    reusable = True
+                    try:
+                        results = await asyncio.to_thread(_search_sync, ddgs, query, region, timelimit, max_results)
+                    except asyncio.CancelledError:
+                        # The worker thread may still be running with this instance, never lend it out again
+                        reusable = False
+                        raise
+                    finally:
+                        if reusable and len(ddgs_pool) < DDGS_POOL_MAX_IDLE:
+                            ddgs_pool.append(ddgs)
+                _ddgs_cache[key] = results
+            return results
+
+        results_list = await asyncio.gather(*[search_cached(q) for q in queries], return_exceptions=True)
 
         all_results = []
-        try:
-            with DDGS() as ddgs:
-                for query in queries:
-                    try:
-                        results = list(ddgs.text(query, region=region, timelimit=timelimit, max_results=max_results))
-                        query_results = {
-                            "query": query,
-                            "results": [
-                                {
-                                    "title": r.get("title", ""),
-                                    "url": r.get("href", ""),
-                                    "snippet": r.get("body", ""),
-                                }
-                                for r in results
-                            ],
-                        }
-                        all_results.append(query_results)
-                    except Exception as e:
-                        logger.error(f"Search error for query '{query}': {e}")
-                        all_results.append({"query": query, "error": str(e)})
-        except Exception as e:
-            logger.error(f"DDGS initialization error: {e}")
-            return f"Error: Failed to initialize search: {e}"
-
-        return json.dumps(all_results, indent=2)
+        for query, results in zip(queries, results_list):
+            if isinstance(results, BaseException):
+                logger.error("Search error for query '%s': %s", query, results)
+                all_results.append({"query": query, "error": str(results)})
+                continue
+            all_results.append({
+                "query": query,
+                "results": [
+                    {
+                        "title": r.get("title", ""),
+                        "url": r.get("href", ""),
+                        "snippet": r.get("body", ""),
+                    }
+                    for r in results
+                ],
+            })
+
+        return _ndjson(all_results)
 
     @rcx.on_tool_call(READ_ARTICLE_TOOL.name)
     async def toolcall_read_article(toolcall: ckit_cloudtool.FCloudtoolCall, model_produced_args: Dict[str, Any]) -> str:
@@ -238,27 +373,35 @@ async def deep_research_main_loop(fclient: ckit_client.FlexusClient, rcx: ckit_b
         if len(urls) > 10:
             return f"Error: Maximum 10 URLs allowed per call. You provided {len(urls)}."
 
-        results = []
-        for url in urls:
+        async def read_one(url: str, cache_key: str) -> Dict[str, Any]:
+            cached = _article_cache.get(cache_key)
+            if cached is not None:
+                return cached
             try:
-                article = Article(url)
-                article.download()
-                article.parse()
-
-                result = {
-                    "url": url,
-                    "title": article.title,
-                    "authors": article.authors,
-                    "publish_date": str(article.publish_date) if article.publish_date else None,
-                    "text": article.text[:5000],
-                    "summary": article.text[:500] + "..." if len(article.text) > 500 else article.text,
-                }
-                results.append(result)
+                async with article_fetch_semaphore:
+                    html = await asyncio.wait_for(_fetch_html(http, url), ARTICLE_FETCH_TIMEOUT)
             except Exception as e:
-                logger.error(f"Error reading article {url}: {e}")
-                results.append({"url": url, "error": str(e)})
-
-        return json.dumps(results, indent=2)
+                err = _fetch_error_str(e)
+                logger.error("Error reading article %s: %s", url, err)
+                return {"url": url, "error": err}
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(_parse_pool, _parse_article, url, html)
+            except Exception as e:
+                logger.error("Error parsing article %s: %s", url, e)
+                return {"url": url, "error": str(e)}
+            _article_cache[cache_key] = result
+            return result
+
+        # The model often echoes the same search hit twice, possibly spelled differently: read each page once
+        # and fan the result back out under every url it was asked for
+        keys = [_canonical_url(u) for u in urls]
+        first_url_by_key = {}
+        for url, key in zip(urls, keys):
+            first_url_by_key.setdefault(key, url)
+        by_key = dict(zip(first_url_by_key, await asyncio.gather(*[read_one(u, k) for k, u in first_url_by_key.items()])))
+        results = [{**by_key[k], "url": u} for u, k in zip(urls, keys)]
+
+        return _ndjson(results)
 
     @rcx.on_tool_call(CREATE_RESEARCH_REPORT_TOOL.name)
     async def toolcall_create_research_report(toolcall: ckit_cloudtool.FCloudtoolCall, model_produced_args: Dict[str, Any]) -> str:
@@ -268,7 +411,7 @@ async def deep_research_main_loop(fclient: ckit_client.FlexusClient, rcx: ckit_b
         research_report_doc = {
             "research_report": {
                 "meta": {
-                    "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
                     "created_by": "deep_research_bot",
                 },
                 **report,
@@ -276,7 +419,7 @@ async def deep_research_main_loop(fclient: ckit_client.FlexusClient, rcx: ckit_b
         }
 
         fuser_id = ckit_external_auth.get_fuser_id_from_rcx(rcx, toolcall.fcall_ft_id)
-        await pdoc_integration.pdoc_create(path, json.dumps(research_report_doc, indent=2), fuser_id)
+        await pdoc_integration.pdoc_create(path, orjson.dumps(research_report_doc).decode(), fuser_id)
         return f"📊 Research report created at: {path}\n\nTopic: {report['topic']}\nConfidence: {report['confidence_level']}\nSources: {len(report['sources'])}"
 
     @rcx.on_tool_call(fi_mongo_store.MONGO_STORE_TOOL.name)
@@ -297,7 +440,9 @@ async def deep_research_main_loop(fclient: ckit_client.FlexusClient, rcx: ckit_b
             await rcx.unpark_collected_events(sleep_if_no_work=10.0)
 
     finally:
-        logger.info("%s exit" % (rcx.persona.persona_id,))
+        await http.aclose()
+        ddgs_pool.clear()
+        logger.info("%s exit", rcx.persona.persona_id)
 
 
 def main():
@@ -306,6 +451,11 @@ def main():
     scenario_fn = ckit_bot_exec.parse_bot_args()
     fclient = ckit_client.FlexusClient(ckit_client.bot_service_name(BOT_NAME, BOT_VERSION), endpoint="/v1/jailed-bot")
 
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        logger.info("uvloop is not available, running on the default asyncio loop")
     asyncio.run(ckit_bot_exec.run_bots_in_this_group(
         fclient,
         marketable_name=BOT_NAME,
@@ -1,5 +1,8 @@
 import asyncio
-import json
+import functools
+import os
+
+import orjson
 
 from flexus_client_kit import ckit_client, ckit_bot_install
 from flexus_client_kit import ckit_cloudtool
@@ -127,7 +130,6 @@ RESEARCH_DEFAULT_LARK = f"""
 print("Processing %d messages" % len(messages))
 msg = messages[-1]
 if msg["role"] == "assistant":
-    content = str(msg.get("content", ""))
     tool_calls = str(msg.get("tool_calls", ""))
 
     # Track research progress
@@ -136,7 +138,7 @@ if msg["role"] == "assistant":
 
     # Remind to create report if research seems complete
     if len(messages) > 5 and "create_research_report" not in tool_calls:
-        content_lower = content.lower()
+        content_lower = str(msg.get("content", "")).lower()
         keywords = ["conclusion", "findings", "summary", "complete"]
         matches = [k for k in keywords if k in content_lower]
         if len(matches) > 0:
@@ -144,6 +146,22 @@ if msg["role"] == "assistant":
 """
 
 
+REQUIREMENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "requirements.txt")
+PICTURE_BIG_B64_PATH = "/workspace/big_image_b64.txt"
+PICTURE_SMALL_B64_PATH = "/workspace/small_image_b64.txt"
+
+
+@functools.cache
+def read_picture_b64(path: str) -> str:
+    # Static deployment assets, read once per process no matter how many personas get installed
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        print(f"Picture {path} not found, installing without it")
+        return ""
+
+
 async def install(
     client: ckit_client.FlexusClient,
     ws_id: str,
@@ -152,18 +170,34 @@ async def install(
     tools: list[ckit_cloudtool.CloudTool],
 ):
     import subprocess
-    import os
 
-    bot_dir = os.path.dirname(os.path.abspath(__file__))
-    requirements_path = os.path.join(bot_dir, "requirements.txt")
+    # run_in_executor() hands the reads to the thread pool right away, so they overlap with the pip install below
+    loop = asyncio.get_running_loop()
+    pictures = asyncio.gather(
+        loop.run_in_executor(None, read_picture_b64, PICTURE_BIG_B64_PATH),
+        loop.run_in_executor(None, read_picture_b64, PICTURE_SMALL_B64_PATH),
+    )
+
+    try:
+        if os.path.exists(REQUIREMENTS_PATH):
+            print(f"Installing dependencies from {REQUIREMENTS_PATH}")
+            subprocess.run(["pip", "install", "-r", REQUIREMENTS_PATH], check=True)
 
-    if os.path.exists(requirements_path):
-        print(f"Installing dependencies from {requirements_path}")
-        subprocess.run(["pip", "install", "-r", requirements_path], check=True)
+        import deep_research_bot
+        # Compare by name: under `python -m deep_research_bot` the caller passes __main__.TOOLS, a different object
+        if [t.name for t in tools] == [t.name for t in deep_research_bot.TOOLS]:
+            bot_internal_tools = deep_research_bot.TOOLS_JSON
+        else:
+            bot_internal_tools = orjson.dumps([t.openai_style_tool() for t in tools]).decode()
+        bot_subchat_tools = deep_research_bot.TOOLS_SUBCHAT_JSON
+    except BaseException:
+        # Nobody will await the reads now: cancel them, and mark the gather's outcome (a CancelledError, or a read
+        # error) as retrieved so asyncio doesn't log "exception was never retrieved" next to the real failure
+        pictures.cancel()
+        pictures.add_done_callback(lambda f: f.cancelled() or f.exception())
+        raise
 
-    import deep_research_bot
-    bot_internal_tools = json.dumps([t.openai_style_tool() for t in tools])
-    bot_subchat_tools = json.dumps([t.openai_style_tool() for t in deep_research_bot.TOOLS_SUBCHAT])
+    picture_big_b64, picture_small_b64 = await pictures
 
     await ckit_bot_install.marketplace_upsert_dev_bot(
         client,
@@ -206,8 +240,8 @@ async def install(
             )),
         ],
         marketable_tags=["Research", "Analysis", "Web Search", "Reports"],
-        marketable_picture_big_b64=open("/workspace/big_image_b64.txt").read(),
-        marketable_picture_small_b64=open("/workspace/small_image_b64.txt").read(),
+        marketable_picture_big_b64=picture_big_b64,
+        marketable_picture_small_b64=picture_small_b64,
         marketable_schedule=[
             prompts_common.SCHED_TASK_SORT_10M | {"sched_when": "EVERY:10m", "sched_first_question": "Check inbox for research tasks and organize them by priority."},
             prompts_common.SCHED_TODO_5M | {"sched_when": "EVERY:5m", "sched_first_question": "Continue working on the assigned research task with systematic methodology."},
@@ -1,3 +1,5 @@
+import functools
+
 from flexus_simple_bots import prompts_common
 
 PROMPT_RESEARCH_REPORTS = """
@@ -13,7 +15,7 @@ Structure:
 {
   "research_report": {
     "meta": {
-      "created_at": "2024-01-15 14:30:00",
+      "created_at": "2024-01-15T14:30:00+00:00",
       "created_by": "deep_research_bot"
     },
     "topic": "Main research topic",
@@ -80,7 +82,7 @@ You have specialized tools for conducting deep research:
 **web_research(queries, max_results_per_query, date_filter)**
 - Performs parallel web searches
 - Use 3-5 focused queries for comprehensive coverage
-- Returns titles, URLs, and snippets
+- Returns one JSON line per query with titles, URLs, and snippets
 - Limited by max_research_depth from setup
 - date_filter: Optional override for date range ('any', 'last_week', 'last_month', 'last_year', or null to use setup default)
 
@@ -88,7 +90,7 @@ You have specialized tools for conducting deep research:
 - Reads and analyzes web content in parallel
 - Can process up to 10 URLs per call
 - Optional 'focus' parameter to extract specific information
-- Returns extracted insights and key points
+- Returns one JSON line per URL with title, authors, publish date, and extracted text
 
 **create_research_report(path, report)**
 - Creates a structured research report document
@@ -104,7 +106,10 @@ You have specialized tools for conducting deep research:
 - Always create a final research report for completed research tasks
 """
 
-deep_research_prompt = f"""
+
+@functools.cache
+def _build_deep_research_prompt() -> str:
+    return f"""
 You are a Deep Research bot, specialized in conducting thorough, systematic research on any topic using web search and content analysis.
 
 Your core capabilities:
@@ -133,3 +138,10 @@ Your setup includes max_research_depth which limits the number of parallel searc
 {prompts_common.PROMPT_A2A_COMMUNICATION}
 {prompts_common.PROMPT_HERE_GOES_SETUP}
 """
+
+
+def __getattr__(name: str) -> str:
+    # deep_research_prompt is assembled on first access only, and just once (PEP 562)
+    if name == "deep_research_prompt":
+        return _build_deep_research_prompt()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")